@@ -14,14 +14,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from os import makedirs, listdir
-from os.path import expanduser, normpath, basename, join, relpath, isdir, isfile, abspath
+from os import makedirs, scandir
+from re import compile as re_compile, escape as re_escape, match as re_match
+from os.path import expanduser, normpath, basename, join, relpath, isdir, abspath
 from io import BytesIO
+from pathlib import PurePath
 from threading import Thread
+from functools import partial
 from queue import Queue
 from webbrowser import open_new_tab
 from datetime import datetime
-from collections import deque
+from collections import deque, namedtuple, OrderedDict
 from json import JSONDecodeError
 from jsonpickle import encode, decode, set_encoder_options
 from lxml.etree import parse, tostring, Comment
@@ -29,8 +32,9 @@ from PyQt5.QtWidgets import (QFileDialog, QColorDialog, QMessageBox, QLabel, QHB
                              QFormLayout, QLineEdit, QSpinBox, QComboBox, QWidget, QPushButton, QSizePolicy, QStatusBar,
                              QCompleter, QApplication, QMainWindow, QUndoCommand, QUndoStack, QMenu, QHeaderView,
                              QAction, QVBoxLayout, QGroupBox, QCheckBox, QRadioButton)
-from PyQt5.QtGui import QIcon, QPixmap, QColor, QFont, QStandardItemModel, QStandardItem
-from PyQt5.QtCore import Qt, pyqtSignal, QStringListModel, QMimeData, QEvent
+from PyQt5.QtGui import QIcon, QPixmap, QColor, QFont, QStandardItemModel, QStandardItem, QValidator
+from PyQt5.QtCore import (Qt, pyqtSignal, pyqtSlot, QObject, QStringListModel, QMimeData, QEvent, QSortFilterProxyModel,
+                          QRegExp, QTimer)
 from PyQt5.uic import loadUi
 from requests import get, head, codes, ConnectionError, Timeout
 from validator import validate_tree, check_warnings, ValidatorError, ValidationError, WarningError, MissingFolderError
@@ -44,6 +48,18 @@ from .exceptions import DesignerError
 from .ui_templates import window_intro, window_mainframe, window_about, window_settings, window_texteditor, \
     window_plaintexteditor, preview_mo
 
+_HOME = expanduser("~")
+_FOMOD_DIR = join(_HOME, ".fomod")
+_DESIGNER_FILE = join(_FOMOD_DIR, ".designer")
+
+_LOGO_DANGER = join(cur_folder, "resources/logos/logo_danger.png")
+_LOGO_MORE = join(cur_folder, "resources/logos/logo_more.png")
+_LOGO_LESS = join(cur_folder, "resources/logos/logo_less.png")
+_LOGO_EXPAND = join(cur_folder, "resources/logos/logo_expand.png")
+_LOGO_COLLAPSE = join(cur_folder, "resources/logos/logo_collapse.png")
+_LOGO_FOLDER = join(cur_folder, "resources/logos/logo_folder.png")
+_LOGO_FILE = join(cur_folder, "resources/logos/logo_file.png")
+
 
 class IntroWindow(QMainWindow, window_intro.Ui_MainWindow):
     """
@@ -125,8 +141,8 @@ class IntroWindow(QMainWindow, window_intro.Ui_MainWindow):
 
         self.settings_dict["General"]["show_intro"] = not self.check_intro.isChecked()
         self.settings_dict["General"]["show_advanced"] = self.check_advanced.isChecked()
-        makedirs(join(expanduser("~"), ".fomod"), exist_ok=True)
-        with open(join(expanduser("~"), ".fomod", ".designer"), "w") as configfile:
+        makedirs(_FOMOD_DIR, exist_ok=True)
+        with open(_DESIGNER_FILE, "w") as configfile:
             set_encoder_options("json", indent=4)
             configfile.write(encode(self.settings_dict))
 
@@ -198,6 +214,9 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
             self._original_item = item
 
     class NodeStandardModel(QStandardItemModel):
+        #: Signals a node was moved by drag-and-drop, carries the node it was dropped into.
+        node_dropped = pyqtSignal([object])
+
         def mimeData(self, index_list):
             if not index_list:
                 return 0
@@ -232,6 +251,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
                     continue
                 parent.child(row_index).xml_node.user_sort_order = str(parent.child(row_index).row()).zfill(7)
                 parent.child(row_index).xml_node.save_metadata()
+            self.node_dropped.emit(parent.xml_node)
             return True
 
         def supportedDragActions(self):
@@ -323,6 +343,70 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
             self.select_node.emit(self.tree_model.indexFromItem(self.item))
             self.current_prop_widgets[self.widget_index].setValue(self.original_int)
 
+    # what the undo commands need from the Property Editor, fixed for as long as a node's props are displayed
+    PropertyContext = namedtuple(
+        "PropertyContext", ["prop_list", "og_values", "tree_model", "item", "select_node", "undo_stack"]
+    )
+
+    class PropertyDispatcher(QObject):
+        """
+        Receives the edit signals from the Property Editor widgets and pushes the matching undo commands.
+
+        Every editor widget's object name is its index in the current prop list, recovered through sender().
+        The context is replaced every time the Property Editor is rebuilt.
+        """
+        def __init__(self, main_window):
+            super().__init__(main_window)
+            self.context = None  # type: MainFrame.PropertyContext
+
+        def push_change(self, command_type, index, new_value):
+            ctx = self.context
+            og_values = ctx.og_values
+            if og_values[index] != new_value:
+                ctx.undo_stack.push(
+                    command_type(
+                        og_values[index],
+                        new_value,
+                        ctx.prop_list,
+                        index,
+                        ctx.tree_model,
+                        ctx.item,
+                        ctx.select_node
+                    )
+                )
+            og_values[index] = new_value
+
+        @pyqtSlot()
+        def on_line_edit_finished(self):
+            line_edit = self.sender()
+            index = int(line_edit.objectName())
+            if line_edit is self.context.prop_list[index]:
+                command_type = MainFrame.LineEditChangeCommand
+            else:
+                command_type = MainFrame.WidgetLineEditChangeCommand
+            self.push_change(command_type, index, line_edit.text())
+
+        @pyqtSlot(int)
+        def on_spin_box_changed(self, new_value):
+            self.push_change(MainFrame.SpinBoxChangeCommand, int(self.sender().objectName()), new_value)
+
+        @pyqtSlot(str)
+        def on_combo_box_activated(self, new_value):
+            self.push_change(MainFrame.ComboBoxChangeCommand, int(self.sender().objectName()), new_value)
+
+    class ForbiddenSequenceValidator(QValidator):
+        """
+        Rejects any input that would contain one of the forbidden sequences matched by pattern.
+        """
+        def __init__(self, pattern, parent=None):
+            super().__init__(parent)
+            self.pattern = pattern
+
+        def validate(self, text, pos):
+            if self.pattern.search(text):
+                return QValidator.Invalid, text, pos
+            return QValidator.Acceptable, text, pos
+
     class RunWizardCommand(QUndoCommand):
         def __init__(self, parent_node, original_node, modified_node, tree_model, select_node_signal):
             super().__init__("Wizard was run on this node.")
@@ -408,6 +492,9 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
             self.parent_item.appendRow(self.pasted_node.model_item)
             self.parent_item.sortChildren(0)
 
+            # select the new item
+            self.select_node_signal.emit(self.tree_model.indexFromItem(self.pasted_node.model_item))
+
         def undo(self):
             self.parent_item.xml_node.remove_child(self.pasted_node)
 
@@ -433,11 +520,16 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         self.actionUndo.setIcon(QIcon(join(cur_folder, "resources/logos/logo_undo.png")))
         self.actionClear.setIcon(QIcon(join(cur_folder, "resources/logos/logo_clear.png")))
         self.menu_Recent_Files.setIcon(QIcon(join(cur_folder, "resources/logos/logo_recent.png")))
-        self.actionExpand_All.setIcon(QIcon(join(cur_folder, "resources/logos/logo_expand.png")))
-        self.actionCollapse_All.setIcon(QIcon(join(cur_folder, "resources/logos/logo_collapse.png")))
+        self.actionExpand_All.setIcon(QIcon(_LOGO_EXPAND))
+        self.actionCollapse_All.setIcon(QIcon(_LOGO_COLLAPSE))
         self.actionHide_Node.setIcon(QIcon(join(cur_folder, "resources/logos/logo_hide.png")))
         self.actionShow_Node.setIcon(QIcon(join(cur_folder, "resources/logos/logo_show.png")))
 
+        # icons reused by the property editor
+        self._danger_pixmap = QPixmap(_LOGO_DANGER)
+        self._danger_icon = QIcon()
+        self._danger_icon.addPixmap(self._danger_pixmap, QIcon.Normal, QIcon.Off)
+
         # manage undo and redo
         self.undo_stack = QUndoStack(self)
         self.undo_stack.setUndoLimit(25)
@@ -457,6 +549,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         self.node_tree_view.setModel(self.node_tree_model)
         self.node_tree_model.itemChanged.connect(lambda item: item.xml_node.save_metadata())
         self.node_tree_model.itemChanged.connect(lambda item: self.xml_code_changed.emit(item.xml_node))
+        self.node_tree_model.node_dropped.connect(self.mark_node_dirty)
 
         # connect actions to the respective methods
         self.action_Open.triggered.connect(self.open)
@@ -491,10 +584,26 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         self._package_path = ""
         self.package_name = ""
         self.settings_dict = read_settings()
+        self._code_refresh = int(self.settings_dict["General"]["code_refresh"])
+        self._emit_xml_on_edit = self._code_refresh >= 3
         self._info_root = None
         self._config_root = None
+        self._info_dirty = False
+        self._config_dirty = False
         self._current_prop_list = []
-        self.original_prop_value_list = {}
+        self.original_prop_value_list = []
+        self.property_dispatcher = self.PropertyDispatcher(self)
+        self._prop_builders = {
+            PropertyText: self._build_text_widget,
+            PropertyHTML: self._build_html_widget,
+            PropertyFlagLabel: self._build_flag_label_widget,
+            PropertyFlagValue: self._build_flag_value_widget,
+            PropertyInt: self._build_int_widget,
+            PropertyCombo: self._build_combo_widget,
+            PropertyFile: self._build_file_widget,
+            PropertyFolder: self._build_folder_widget,
+            PropertyColour: self._build_colour_widget,
+        }
 
         # start the preview threads
         self.preview_queue = Queue()
@@ -521,10 +630,13 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         self.flag_label_completer = QCompleter()
         self.flag_label_completer.setCaseSensitivity(Qt.CaseInsensitive)
         self.flag_label_completer.setModel(self.flag_label_model)
-        self.flag_value_model = QStringListModel()
+        self.flag_value_model = QStandardItemModel()
+        self.flag_value_proxy = QSortFilterProxyModel()
+        self.flag_value_proxy.setSourceModel(self.flag_value_model)
+        self.flag_value_proxy.setFilterRole(Qt.UserRole)
         self.flag_value_completer = QCompleter()
         self.flag_value_completer.setCaseSensitivity(Qt.CaseInsensitive)
-        self.flag_value_completer.setModel(self.flag_value_model)
+        self.flag_value_completer.setModel(self.flag_value_proxy)
 
         # connect node selected signal
         self.current_node = None  # type: _NodeElement
@@ -534,7 +646,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         self.select_node.connect(lambda index: self.node_tree_view.setCurrentIndex(index))
         self.select_node.connect(
             lambda: self.update_previews.emit(self.current_node)
-            if self.settings_dict["General"]["code_refresh"] >= 2 else None
+            if self._code_refresh >= 2 else None
         )
         self.select_node.connect(self.update_children_box)
         self.select_node.connect(self.update_props_list)
@@ -563,6 +675,13 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         # manage code changed signal
         self.xml_code_changed.connect(self.update_previews.emit)
 
+        # property edits are coalesced so a burst of keystrokes only refreshes the code once
+        self._pending_xml_node = None
+        self._xml_refresh_timer = QTimer(self)
+        self._xml_refresh_timer.setSingleShot(True)
+        self._xml_refresh_timer.setInterval(50)
+        self._xml_refresh_timer.timeout.connect(lambda: self.xml_code_changed.emit(self._pending_xml_node))
+
         # manage clean/dirty states
         self.undo_stack.cleanChanged.connect(
             lambda clean: self.setWindowTitle(self.package_name + " - " + self.original_title)
@@ -572,6 +691,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         self.undo_stack.cleanChanged.connect(
             lambda clean: self.action_Save.setEnabled(not clean)
         )
+        self.undo_stack.indexChanged.connect(self.mark_dirty)
 
         self.update_recent_files()
         self.check_updates()
@@ -601,6 +721,31 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         node_tree_context_menu.move(self.node_tree_view.mapToGlobal(position))
         node_tree_context_menu.exec_()
 
+    def mark_dirty(self):
+        """
+        Marks the tree holding the current node as modified so save only sorts and validates what changed.
+
+        Every undo command selects the node it affected, so the current node tells us which tree was touched.
+        """
+        self.mark_node_dirty(self.current_node)
+
+    def mark_node_dirty(self, node):
+        """
+        Marks the tree holding node as modified. If the tree can't be told, both are marked.
+
+        :param node: The node that was modified.
+        """
+        if node is None:
+            self._info_dirty = self._config_dirty = True
+            return
+        root = node.getroottree().getroot()
+        if root is self._info_root:
+            self._info_dirty = True
+        elif root is self._config_root:
+            self._config_dirty = True
+        else:
+            self._info_dirty = self._config_dirty = True
+
     def set_current_node(self, selected_node):
         self.current_node = selected_node
 
@@ -638,22 +783,59 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
             )
 
     @staticmethod
-    def update_flag_label_completer(label_model, elem_root):
+    def update_flag_completers(label_model, value_model, elem_root):
+        """
+        Rebuilds both flag completer models in a single pass over the tree.
+
+        The value model holds every flag value with its label stored under Qt.UserRole,
+        so the value completer only needs its proxy filter changed when the label changes.
+        """
         label_list = []
+        label_set = set()
+        value_pairs = []
+        value_pair_set = set()
         for elem in elem_root.iter():
             if elem.tag == "flag":
-                value = elem.properties["name"].value
-                if value not in label_list:
-                    label_list.append(value)
+                label = elem.properties["name"].value
+                if label not in label_set:
+                    label_set.add(label)
+                    label_list.append(label)
+                if elem.text and (label, elem.text) not in value_pair_set:
+                    value_pair_set.add((label, elem.text))
+                    value_pairs.append((label, elem.text))
         label_model.setStringList(label_list)
+        value_model.clear()
+        for label, value in value_pairs:
+            value_item = QStandardItem(value)
+            value_item.setData(label, Qt.UserRole)
+            value_model.appendRow(value_item)
 
     @staticmethod
-    def update_flag_value_completer(value_model, elem_root, label):
-        value_list = []
-        for elem in elem_root.iter():
-            if elem.tag == "flag" and elem.text not in value_list and elem.properties["name"].value == label:
-                value_list.append(elem.text)
-        value_model.setStringList(value_list)
+    def update_flag_value_completer(value_proxy, label):
+        value_proxy.setFilterRegExp(QRegExp("^" + QRegExp.escape(label) + "$"))
+
+    def _add_update_button(self):
+        update_button = QPushButton("New Version Available!")
+        update_button.setFlat(True)
+        update_button.clicked.connect(lambda: open_new_tab("https://github.com/GandaG/fomod-designer/releases/latest"))
+        self.statusBar().addPermanentWidget(update_button)
+
+    def _check_remote(self):
+        try:
+            response = get(
+                "https://api.github.com/repos/GandaG/fomod-designer/releases",
+                params={"per_page": 1},
+                timeout=10
+            )
+            if (response.status_code == codes.ok and
+                    version_tuple(response.json()[0]["tag_name"][1:]) > version_tuple(__version__)):
+                self.update_check_update_available.emit()
+            else:
+                self.update_check_up_to_date.emit()
+        except Timeout:
+            self.update_check_timeout.emit()
+        except ConnectionError:
+            self.update_check_connection_error.emit()
 
     def check_updates(self):
         """
@@ -663,31 +845,12 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         If the remote version is higher, then the user is warned in the status bar and advised to get the new one.
         Otherwise, ignore.
         """
-
-        def update_available_button():
-            update_button = QPushButton("New Version Available!")
-            update_button.setFlat(True)
-            update_button.clicked.connect(lambda: open_new_tab("https://github.com/GandaG/fomod-designer/releases/latest"))
-            self.statusBar().addPermanentWidget(update_button)
-
-        def check_remote():
-            try:
-                response = get("https://api.github.com/repos/GandaG/fomod-designer/releases", timeout=10)
-                if response.status_code == codes.ok and response.json()[0]["tag_name"][1:] > __version__:
-                    self.update_check_update_available.emit()
-                else:
-                    self.update_check_up_to_date.emit()
-            except Timeout:
-                self.update_check_timeout.emit()
-            except ConnectionError:
-                self.update_check_connection_error.emit()
-
         self.update_check_up_to_date.connect(lambda: self.setStatusBar(QStatusBar()))
         self.update_check_up_to_date.connect(
             lambda: self.statusBar().addPermanentWidget(QLabel("Everything is up-to-date."))
         )
         self.update_check_update_available.connect(lambda: self.setStatusBar(QStatusBar()))
-        self.update_check_update_available.connect(update_available_button)
+        self.update_check_update_available.connect(self._add_update_button)
         self.update_check_timeout.connect(lambda: self.setStatusBar(QStatusBar()))
         self.update_check_timeout.connect(lambda: self.statusBar().addPermanentWidget(QLabel("Connection timed out.")))
         self.update_check_connection_error.connect(lambda: self.setStatusBar(QStatusBar()))
@@ -699,7 +862,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
 
         self.statusBar().addPermanentWidget(QLabel("Checking for updates..."))
 
-        Thread(target=check_remote).start()
+        Thread(target=self._check_remote).start()
 
     def hide_node(self):
         if self.current_node is not None:
@@ -728,13 +891,13 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
                 pass
 
             if not path:
-                open_dialog = QFileDialog()
-                package_path = open_dialog.getExistingDirectory(self, "Select package root directory:", expanduser("~"))
+                package_path = QFileDialog.getExistingDirectory(self, "Select package root directory:", _HOME)
             else:
                 package_path = path
 
             if package_path:
-                info_root, config_root = import_(normpath(package_path))
+                normed_path = normpath(package_path)
+                info_root, config_root = import_(normed_path)
                 if info_root is not None and config_root is not None:
                     if self.settings_dict["Load"]["validate"]:
                         try:
@@ -767,16 +930,17 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
                 self.node_tree_model.appendRow(self._info_root.model_item)
                 self.node_tree_model.appendRow(self._config_root.model_item)
 
-                self.package_name = basename(normpath(self._package_path))
+                self.package_name = basename(normed_path)
                 self.current_node = None
                 self.xml_code_changed.emit(self.current_node)
                 self.undo_stack.setClean()
                 self.undo_stack.cleanChanged.emit(True)
                 self.undo_stack.clear()
+                self._info_dirty = self._config_dirty = False
                 QApplication.clipboard().clear()
                 self.actionPaste.setEnabled(False)
                 self.action_Delete.setEnabled(False)
-                self.update_recent_files(self._package_path)
+                self.update_recent_files(normed_path)
                 self.clear_prop_list()
                 self.button_wizard.setEnabled(False)
         except (DesignerError, ValidatorError) as p:
@@ -793,9 +957,11 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
             if self._info_root is None and self._config_root is None:
                 return
             elif not self.undo_stack.isClean():
-                self._info_root.sort()
-                self._config_root.sort()
-                if self.settings_dict["Save"]["validate"]:
+                if self._info_dirty:
+                    self._info_root.sort()
+                if self._config_dirty:
+                    self._config_root.sort()
+                if self._config_dirty and self.settings_dict["Save"]["validate"]:
                     try:
                         validate_tree(
                             parse(BytesIO(tostring(self._config_root, pretty_print=True))),
@@ -805,7 +971,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
                         generic_errorbox(e.title, str(e), e.detailed).exec_()
                         if not self.settings_dict["Save"]["validate_ignore"]:
                             return
-                if self.settings_dict["Save"]["warnings"]:
+                if self._config_dirty and self.settings_dict["Save"]["warnings"]:
                     try:
                         check_warnings(
                             self._package_path,
@@ -819,6 +985,7 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
                             return
                 export(self._info_root, self._config_root, self._package_path)
                 self.undo_stack.setClean()
+                self._info_dirty = self._config_dirty = False
         except (DesignerError, ValidatorError) as e:
             generic_errorbox(e.title, str(e), e.detailed).exec_()
             return
@@ -830,12 +997,19 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         config = SettingsDialog(self)
         config.exec_()
         self.settings_dict = read_settings()
+        self._code_refresh = int(self.settings_dict["General"]["code_refresh"])
+        emit_xml_on_edit = self._code_refresh >= 3
+        if emit_xml_on_edit != self._emit_xml_on_edit:
+            self._emit_xml_on_edit = emit_xml_on_edit
+            # the property editor only connects the code refresh when it is built
+            if self.current_node is not None:
+                self.update_props_list()
 
     def refresh(self):
         """
         Refreshes all the previews if the refresh rate in Settings is high enough.
         """
-        if self.settings_dict["General"]["code_refresh"] >= 1:
+        if self._code_refresh >= 1:
             self.update_previews.emit(self.current_node)
 
     def delete(self):
@@ -882,8 +1056,8 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         Clears the Recent Files gui menu and settings.
         """
         self.settings_dict["Recent Files"].clear()
-        makedirs(join(expanduser("~"), ".fomod"), exist_ok=True)
-        with open(join(expanduser("~"), ".fomod", ".designer"), "w") as configfile:
+        makedirs(_FOMOD_DIR, exist_ok=True)
+        with open(_DESIGNER_FILE, "w") as configfile:
             set_encoder_options("json", indent=4)
             configfile.write(encode(self.settings_dict))
 
@@ -915,8 +1089,8 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
 
         # write the new list to the settings file
         self.settings_dict["Recent Files"] = file_list
-        makedirs(join(expanduser("~"), ".fomod"), exist_ok=True)
-        with open(join(expanduser("~"), ".fomod", ".designer"), "w") as configfile:
+        makedirs(_FOMOD_DIR, exist_ok=True)
+        with open(_DESIGNER_FILE, "w") as configfile:
             set_encoder_options("json", indent=4)
             configfile.write(encode(self.settings_dict))
 
@@ -943,6 +1117,13 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         if self.current_node.tag is not Comment:
             children_list.insert(0, NodeComment)
 
+        required_children = self.current_node.required_children
+        either_children = self.current_node.either_children_group
+        at_least_one_children = self.current_node.at_least_one_children_group
+        required_colour = QColor(self.settings_dict["Appearance"]["required_colour"]).name()
+        either_colour = QColor(self.settings_dict["Appearance"]["either_colour"]).name()
+        atleastone_colour = QColor(self.settings_dict["Appearance"]["atleastone_colour"]).name()
+
         for child in children_list:
             new_object = child()
             child_button = QPushButton(new_object.name)
@@ -968,24 +1149,18 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
             )
             if not self.current_node.can_add_child(new_object):
                 child_button.setEnabled(False)
-            if child in self.current_node.required_children:
-                child_button.setStyleSheet(
-                    "background-color: " + QColor(self.settings_dict["Appearance"]["required_colour"]).name()
-                )
+            if child in required_children:
+                child_button.setStyleSheet("background-color: " + required_colour)
                 child_button.setStatusTip(
                     "A button of this colour indicates that at least one of this node is required."
                 )
-            if child in self.current_node.either_children_group:
-                child_button.setStyleSheet(
-                    "background-color: " + QColor(self.settings_dict["Appearance"]["either_colour"]).name()
-                )
+            if child in either_children:
+                child_button.setStyleSheet("background-color: " + either_colour)
                 child_button.setStatusTip(
                     "A button of this colour indicates that only one of these buttons must be used."
                 )
-            if child in self.current_node.at_least_one_children_group:
-                child_button.setStyleSheet(
-                    "background-color: " + QColor(self.settings_dict["Appearance"]["atleastone_colour"]).name()
-                )
+            if child in at_least_one_children:
+                child_button.setStyleSheet("background-color: " + atleastone_colour)
                 child_button.setStatusTip(
                     "A button of this colour indicates that from all of these buttons, at least one is required."
                 )
@@ -996,478 +1171,354 @@ class MainFrame(QMainWindow, window_mainframe.Ui_MainWindow):
         """
         Deletes all the properties from the Property Editor
         """
+        # a refresh still pending belongs to the node being left, not the one about to be shown
+        self._xml_refresh_timer.stop()
+        self._pending_xml_node = None
         self._current_prop_list.clear()
+        self.original_prop_value_list.clear()
         for index in reversed(range(self.layout_prop_editor.count())):
             widget = self.layout_prop_editor.takeAt(index).widget()
             if widget is not None:
                 widget.deleteLater()
 
+    def _schedule_xml_refresh(self, node):
+        """
+        Emits xml_code_changed for node once the Property Editor has been idle for the timer's interval.
+
+        :param node: The node that was edited.
+        """
+        self._pending_xml_node = node
+        self._xml_refresh_timer.start()
+
+    @staticmethod
+    def _forbidden_pattern(node):
+        """
+        Compiles a single pattern matching any of the node's forbidden sequences.
+        """
+        return re_compile("|".join(re_escape(sequence) for sequence in node.forbidden_sequences))
+
+    def _open_plaintext_editor(self, line_edit_, node):
+        """
+        Opens the plain text editor dialog for line_edit_ - forbidden sequences are stripped if node is a comment.
+        """
+        dialog_ui = window_plaintexteditor.Ui_Dialog()
+        dialog = QDialog(self)
+        dialog_ui.setupUi(dialog)
+        dialog_ui.edit_text.setPlainText(line_edit_.text())
+        if node.tag is Comment:
+            forbidden_pattern = self._forbidden_pattern(node)
+            dialog_ui.edit_text.textChanged.connect(
+                lambda: dialog_ui.edit_text.setText(
+                    forbidden_pattern.sub("", dialog_ui.edit_text.toPlainText())
+                ) if forbidden_pattern.search(dialog_ui.edit_text.toPlainText()) else None
+            )
+        dialog_ui.buttonBox.accepted.connect(dialog.close)
+        dialog_ui.buttonBox.accepted.connect(lambda: line_edit_.setText(dialog_ui.edit_text.toPlainText()))
+        dialog_ui.buttonBox.accepted.connect(line_edit_.editingFinished.emit)
+        dialog.exec_()
+
+    def _open_html_editor(self, line_edit_):
+        """
+        Opens the rich text editor dialog for line_edit_.
+        """
+        dialog_ui = window_texteditor.Ui_Dialog()
+        dialog = QDialog(self)
+        dialog_ui.setupUi(dialog)
+
+        dialog_ui.radio_html.toggled.connect(dialog_ui.widget_warning.setVisible)
+        dialog_ui.button_colour.clicked.connect(
+            lambda: dialog_ui.edit_text.setTextColor(QColorDialog.getColor())
+        )
+        dialog_ui.button_bold.clicked.connect(
+            lambda: dialog_ui.edit_text.setFontWeight(QFont.Bold)
+            if dialog_ui.edit_text.fontWeight() == QFont.Normal
+            else dialog_ui.edit_text.setFontWeight(QFont.Normal)
+        )
+        dialog_ui.button_italic.clicked.connect(
+            lambda: dialog_ui.edit_text.setFontItalic(not dialog_ui.edit_text.fontItalic())
+        )
+        dialog_ui.button_underline.clicked.connect(
+            lambda: dialog_ui.edit_text.setFontUnderline(not dialog_ui.edit_text.fontUnderline())
+        )
+        dialog_ui.button_align_left.clicked.connect(
+            lambda: dialog_ui.edit_text.setAlignment(Qt.AlignLeft)
+        )
+        dialog_ui.button_align_center.clicked.connect(
+            lambda: dialog_ui.edit_text.setAlignment(Qt.AlignCenter)
+        )
+        dialog_ui.button_align_right.clicked.connect(
+            lambda: dialog_ui.edit_text.setAlignment(Qt.AlignRight)
+        )
+        dialog_ui.button_align_justify.clicked.connect(
+            lambda: dialog_ui.edit_text.setAlignment(Qt.AlignJustify)
+        )
+        dialog_ui.buttonBox.accepted.connect(dialog.close)
+        dialog_ui.buttonBox.accepted.connect(
+            lambda: line_edit_.setText(dialog_ui.edit_text.toPlainText())
+            if dialog_ui.radio_plain.isChecked()
+            else line_edit_.setText(dialog_ui.edit_text.toHtml())
+        )
+        dialog_ui.buttonBox.accepted.connect(line_edit_.editingFinished.emit)
+
+        dialog_ui.widget_warning.hide()
+        dialog_ui.label_warning.setPixmap(self._danger_pixmap)
+        dialog_ui.button_colour.setIcon(QIcon(join(cur_folder, "resources/logos/logo_font_colour.png")))
+        dialog_ui.button_bold.setIcon(QIcon(join(cur_folder, "resources/logos/logo_font_bold.png")))
+        dialog_ui.button_italic.setIcon(QIcon(join(cur_folder, "resources/logos/logo_font_italic.png")))
+        dialog_ui.button_underline.setIcon(QIcon(
+            join(cur_folder, "resources/logos/logo_font_underline.png")
+        ))
+        dialog_ui.button_align_left.setIcon(QIcon(
+            join(cur_folder, "resources/logos/logo_font_align_left.png")
+        ))
+        dialog_ui.button_align_center.setIcon(QIcon(
+            join(cur_folder, "resources/logos/logo_font_align_center.png")
+        ))
+        dialog_ui.button_align_right.setIcon(QIcon(
+            join(cur_folder, "resources/logos/logo_font_align_right.png")
+        ))
+        dialog_ui.button_align_justify.setIcon(QIcon(
+            join(cur_folder, "resources/logos/logo_font_align_justify.png")
+        ))
+        dialog_ui.edit_text.setText(line_edit_.text())
+        dialog.exec_()
+
+    def _build_text_widget(self, prop, prop_index, node):
+        widget = QWidget(self.dockWidgetContents)
+        layout = QHBoxLayout(widget)
+        text_edit = QLineEdit(widget)
+        text_edit.setObjectName(str(prop_index))
+        text_button = QPushButton(widget)
+        text_button.setText("...")
+        text_button.setMaximumWidth(30)
+        layout.addWidget(text_edit)
+        layout.addWidget(text_button)
+        layout.setContentsMargins(0, 0, 0, 0)
+        text_edit.setText(prop.value)
+        if node.tag is Comment:
+            text_edit.setValidator(
+                self.ForbiddenSequenceValidator(self._forbidden_pattern(node), text_edit)
+            )
+        text_edit.textChanged.connect(prop.set_value)
+        text_edit.textChanged.connect(node.write_attribs)
+        text_edit.textChanged.connect(node.update_item_name)
+        if self._emit_xml_on_edit:
+            text_edit.textChanged.connect(lambda: self._schedule_xml_refresh(node))
+        text_edit.editingFinished.connect(self.property_dispatcher.on_line_edit_finished)
+        text_button.clicked.connect(partial(self._open_plaintext_editor, text_edit, node))
+        return widget
+
+    def _build_html_widget(self, prop, prop_index, node):
+        widget = QWidget(self.dockWidgetContents)
+        layout = QHBoxLayout(widget)
+        text_edit = QLineEdit(widget)
+        text_edit.setObjectName(str(prop_index))
+        text_button = QPushButton(widget)
+        text_button.setText("...")
+        text_button.setMaximumWidth(30)
+        layout.addWidget(text_edit)
+        layout.addWidget(text_button)
+        layout.setContentsMargins(0, 0, 0, 0)
+        text_edit.setText(prop.value)
+        text_edit.textChanged.connect(prop.set_value)
+        text_edit.textChanged.connect(node.write_attribs)
+        text_edit.textChanged.connect(node.update_item_name)
+        if self._emit_xml_on_edit:
+            text_edit.textChanged.connect(lambda: self._schedule_xml_refresh(node))
+        text_edit.editingFinished.connect(self.property_dispatcher.on_line_edit_finished)
+        text_button.clicked.connect(partial(self._open_html_editor, text_edit))
+        return widget
+
+    def _build_flag_label_widget(self, prop, prop_index, node):
+        widget = QLineEdit(self.dockWidgetContents)
+        self.update_flag_completers(self.flag_label_model, self.flag_value_model, self._config_root)
+        self.flag_label_completer.activated[str].connect(widget.setText)
+        widget.setCompleter(self.flag_label_completer)
+        widget.textChanged.connect(
+            lambda text: self.update_flag_value_completer(self.flag_value_proxy, text)
+        )
+        widget.setText(prop.value)
+        widget.textChanged.connect(prop.set_value)
+        widget.textChanged.connect(node.write_attribs)
+        widget.textChanged.connect(node.update_item_name)
+        if self._emit_xml_on_edit:
+            widget.textChanged.connect(lambda: self._schedule_xml_refresh(node))
+        widget.editingFinished.connect(self.property_dispatcher.on_line_edit_finished)
+        return widget
+
+    def _build_flag_value_widget(self, prop, prop_index, node):
+        widget = QLineEdit(self.dockWidgetContents)
+        widget.setCompleter(self.flag_value_completer)
+        self.flag_value_completer.activated[str].connect(widget.setText)
+        widget.setText(prop.value)
+        widget.textChanged.connect(prop.set_value)
+        widget.textChanged.connect(node.write_attribs)
+        widget.textChanged.connect(node.update_item_name)
+        if self._emit_xml_on_edit:
+            widget.textChanged.connect(lambda: self._schedule_xml_refresh(node))
+        widget.editingFinished.connect(self.property_dispatcher.on_line_edit_finished)
+        return widget
+
+    def _build_int_widget(self, prop, prop_index, node):
+        widget = QSpinBox(self.dockWidgetContents)
+        widget.setMinimum(prop.min)
+        widget.setMaximum(prop.max)
+        widget.setValue(int(prop.value))
+        widget.valueChanged.connect(prop.set_value)
+        widget.valueChanged.connect(node.write_attribs)
+        if self._emit_xml_on_edit:
+            widget.valueChanged.connect(lambda: self._schedule_xml_refresh(node))
+        widget.valueChanged.connect(self.property_dispatcher.on_spin_box_changed)
+        return widget
+
+    def _build_combo_widget(self, prop, prop_index, node):
+        widget = QComboBox(self.dockWidgetContents)
+        widget.insertItems(0, prop.values)
+        widget.setCurrentIndex(prop.value_index[prop.value])
+        widget.currentTextChanged.connect(prop.set_value)
+        widget.currentTextChanged.connect(node.write_attribs)
+        widget.currentTextChanged.connect(node.update_item_name)
+        if self._emit_xml_on_edit:
+            widget.currentTextChanged.connect(lambda: self._schedule_xml_refresh(node))
+        widget.activated[str].connect(self.property_dispatcher.on_combo_box_activated)
+        return widget
+
+    def _build_line_edit_with_button(self, prop, prop_index, node, button_clicked, max_length=None,
+                                     update_name=True):
+        """
+        Builds the line edit + push button pair shared by the file, folder and colour properties.
+
+        :param prop: The property being edited.
+        :param prop_index: The property's row in the editor.
+        :param node: The node the property belongs to.
+        :param button_clicked: The callable connected to the button's clicked signal.
+        :param max_length: The line edit's maximum length, if any. Set before the initial text.
+        :param update_name: Whether edits should update the node's item name.
+        :return: A tuple with the wrapper widget, the line edit and the push button.
+        """
+        widget = QWidget(self.dockWidgetContents)
+        layout = QHBoxLayout(widget)
+        line_edit = QLineEdit(widget)
+        line_edit.setObjectName(str(prop_index))
+        if max_length is not None:
+            line_edit.setMaxLength(max_length)
+        push_button = QPushButton(widget)
+        push_button.setMaximumWidth(30)
+        layout.addWidget(line_edit)
+        layout.addWidget(push_button)
+        layout.setContentsMargins(0, 0, 0, 0)
+        line_edit.setText(prop.value)
+        line_edit.textChanged.connect(prop.set_value)
+        line_edit.textChanged.connect(node.write_attribs)
+        if update_name:
+            line_edit.textChanged.connect(node.update_item_name)
+        if self._emit_xml_on_edit:
+            line_edit.textChanged.connect(lambda: self._schedule_xml_refresh(node))
+        line_edit.editingFinished.connect(self.property_dispatcher.on_line_edit_finished)
+        push_button.clicked.connect(button_clicked)
+        return widget, line_edit, push_button
+
+    def _build_file_widget(self, prop, prop_index, node):
+        def button_clicked():
+            file_path = QFileDialog.getOpenFileName(self, "Select File:", self._package_path)
+            if file_path[0]:
+                line_edit.setText(relpath(file_path[0], self._package_path))
+            line_edit.editingFinished.emit()
+
+        widget, line_edit, push_button = self._build_line_edit_with_button(prop, prop_index, node, button_clicked)
+        push_button.setText("...")
+        return widget
+
+    def _build_folder_widget(self, prop, prop_index, node):
+        def button_clicked():
+            folder_path = QFileDialog.getExistingDirectory(self, "Select folder:", self._package_path)
+            if folder_path:
+                line_edit.setText(relpath(folder_path, self._package_path))
+            line_edit.editingFinished.emit()
+
+        widget, line_edit, push_button = self._build_line_edit_with_button(prop, prop_index, node, button_clicked)
+        push_button.setText("...")
+        return widget
+
+    def _build_colour_widget(self, prop, prop_index, node):
+        def button_clicked():
+            init_colour = QColor("#" + prop.value)
+            colour = QColorDialog.getColor(init_colour, self, "Choose Colour:")
+            if colour.isValid():
+                line_edit.setText(colour.name()[1:])
+            line_edit.editingFinished.emit()
+
+        # the colour currently on the button: None while it shows the warning icon,
+        # "" before anything was applied so the first update always restyles
+        shown_colour = ""
+
+        def update_button_colour(text):
+            nonlocal shown_colour
+            # partial hex codes can't be valid, no need to parse them
+            new_colour = None
+            if len(text) == 6:
+                colour = QColor("#" + text)
+                if colour.isValid():
+                    new_colour = colour.name()
+            if new_colour == shown_colour:
+                return
+            shown_colour = new_colour
+            if new_colour is not None:
+                push_button.setStyleSheet("background-color: " + new_colour)
+                push_button.setIcon(QIcon())
+            else:
+                push_button.setStyleSheet("background-color: #ffffff")
+                push_button.setIcon(self._danger_icon)
+
+        widget, line_edit, push_button = self._build_line_edit_with_button(
+            prop, prop_index, node, button_clicked, max_length=6, update_name=False
+        )
+        push_button.setMinimumHeight(21)
+        push_button.setMinimumWidth(30)
+        push_button.setMaximumHeight(21)
+        update_button_colour(line_edit.text())
+        line_edit.textChanged.connect(update_button_colour)
+        return widget
+
     def update_props_list(self):
         """
         Updates the Property Editor's prop list. Deletes everything and
         then creates the list from the node's properties.
+
+        Each property's editor widget is built by the method registered for its type in _prop_builders.
         """
         self.clear_prop_list()
 
         prop_index = 0
         og_values = self.original_prop_value_list
         prop_list = self._current_prop_list
-        props = self.current_node.properties
-
-        for key in props:
-            if not props[key].editable:
-                continue
-
-            label = QLabel(self.dockWidgetContents)
-            label.setObjectName("label_" + str(prop_index))
-            label.setText(props[key].name)
-            self.layout_prop_editor.setWidget(prop_index, QFormLayout.LabelRole, label)
-
-            if type(props[key]) is PropertyText:
-                def open_plain_editor(line_edit_, node):
-                    dialog_ui = window_plaintexteditor.Ui_Dialog()
-                    dialog = QDialog(self)
-                    dialog_ui.setupUi(dialog)
-                    dialog_ui.edit_text.setPlainText(line_edit_.text())
-                    if node.tag is Comment:
-                        for sequence in node.forbidden_sequences:
-                            dialog_ui.edit_text.textChanged.connect(
-                                lambda: dialog_ui.edit_text.setText(
-                                    dialog_ui.edit_text.toPlainText().replace(sequence, "")
-                                ) if sequence in dialog_ui.edit_text.toPlainText() else None
-                            )
-                    dialog_ui.buttonBox.accepted.connect(dialog.close)
-                    dialog_ui.buttonBox.accepted.connect(lambda: line_edit_.setText(dialog_ui.edit_text.toPlainText()))
-                    dialog_ui.buttonBox.accepted.connect(line_edit_.editingFinished.emit)
-                    dialog.exec_()
-
-                og_values[prop_index] = props[key].value
-                prop_list.append(QWidget(self.dockWidgetContents))
-                layout = QHBoxLayout(prop_list[prop_index])
-                text_edit = QLineEdit(prop_list[prop_index])
-                text_button = QPushButton(prop_list[prop_index])
-                text_button.setText("...")
-                text_button.setMaximumWidth(30)
-                layout.addWidget(text_edit)
-                layout.addWidget(text_button)
-                layout.setContentsMargins(0, 0, 0, 0)
-                text_edit.setText(props[key].value)
-                if self.current_node.tag is Comment:
-                    for sequence in self.current_node.forbidden_sequences:
-                        text_edit.textChanged.connect(
-                            lambda: text_edit.setText(
-                                text_edit.text().replace(sequence, "")
-                            ) if sequence in text_edit.text() else None
-                        )
-                text_edit.textChanged.connect(props[key].set_value)
-                text_edit.textChanged[str].connect(self.current_node.write_attribs)
-                text_edit.textChanged[str].connect(self.current_node.update_item_name)
-                text_edit.textChanged[str].connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                text_edit.editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.WidgetLineEditChangeCommand(
-                            og_values[index],
-                            text_edit.text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != text_edit.text() else None
-                )
-                text_edit.editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: text_edit.text()})
-                )
-                text_button.clicked.connect(
-                    lambda _, line_edit_=text_edit, node=self.current_node: open_plain_editor(line_edit_, node)
-                )
-
-            if type(props[key]) is PropertyHTML:
-                def open_plain_editor(line_edit_):
-                    dialog_ui = window_texteditor.Ui_Dialog()
-                    dialog = QDialog(self)
-                    dialog_ui.setupUi(dialog)
-
-                    dialog_ui.radio_html.toggled.connect(dialog_ui.widget_warning.setVisible)
-                    dialog_ui.button_colour.clicked.connect(
-                        lambda: dialog_ui.edit_text.setTextColor(QColorDialog.getColor())
-                    )
-                    dialog_ui.button_bold.clicked.connect(
-                        lambda: dialog_ui.edit_text.setFontWeight(QFont.Bold)
-                        if dialog_ui.edit_text.fontWeight() == QFont.Normal
-                        else dialog_ui.edit_text.setFontWeight(QFont.Normal)
-                    )
-                    dialog_ui.button_italic.clicked.connect(
-                        lambda: dialog_ui.edit_text.setFontItalic(not dialog_ui.edit_text.fontItalic())
-                    )
-                    dialog_ui.button_underline.clicked.connect(
-                        lambda: dialog_ui.edit_text.setFontUnderline(not dialog_ui.edit_text.fontUnderline())
-                    )
-                    dialog_ui.button_align_left.clicked.connect(
-                        lambda: dialog_ui.edit_text.setAlignment(Qt.AlignLeft)
-                    )
-                    dialog_ui.button_align_center.clicked.connect(
-                        lambda: dialog_ui.edit_text.setAlignment(Qt.AlignCenter)
-                    )
-                    dialog_ui.button_align_right.clicked.connect(
-                        lambda: dialog_ui.edit_text.setAlignment(Qt.AlignRight)
-                    )
-                    dialog_ui.button_align_justify.clicked.connect(
-                        lambda: dialog_ui.edit_text.setAlignment(Qt.AlignJustify)
-                    )
-                    dialog_ui.buttonBox.accepted.connect(dialog.close)
-                    dialog_ui.buttonBox.accepted.connect(
-                        lambda: line_edit_.setText(dialog_ui.edit_text.toPlainText())
-                        if dialog_ui.radio_plain.isChecked()
-                        else line_edit_.setText(dialog_ui.edit_text.toHtml())
-                    )
-                    dialog_ui.buttonBox.accepted.connect(line_edit_.editingFinished.emit)
-
-                    dialog_ui.widget_warning.hide()
-                    dialog_ui.label_warning.setPixmap(QPixmap(join(cur_folder, "resources/logos/logo_danger.png")))
-                    dialog_ui.button_colour.setIcon(QIcon(join(cur_folder, "resources/logos/logo_font_colour.png")))
-                    dialog_ui.button_bold.setIcon(QIcon(join(cur_folder, "resources/logos/logo_font_bold.png")))
-                    dialog_ui.button_italic.setIcon(QIcon(join(cur_folder, "resources/logos/logo_font_italic.png")))
-                    dialog_ui.button_underline.setIcon(QIcon(
-                        join(cur_folder, "resources/logos/logo_font_underline.png")
-                    ))
-                    dialog_ui.button_align_left.setIcon(QIcon(
-                        join(cur_folder, "resources/logos/logo_font_align_left.png")
-                    ))
-                    dialog_ui.button_align_center.setIcon(QIcon(
-                        join(cur_folder, "resources/logos/logo_font_align_center.png")
-                    ))
-                    dialog_ui.button_align_right.setIcon(QIcon(
-                        join(cur_folder, "resources/logos/logo_font_align_right.png")
-                    ))
-                    dialog_ui.button_align_justify.setIcon(QIcon(
-                        join(cur_folder, "resources/logos/logo_font_align_justify.png")
-                    ))
-                    dialog_ui.edit_text.setText(line_edit_.text())
-                    dialog.exec_()
-
-                og_values[prop_index] = props[key].value
-                prop_list.append(QWidget(self.dockWidgetContents))
-                layout = QHBoxLayout(prop_list[prop_index])
-                text_edit = QLineEdit(prop_list[prop_index])
-                text_button = QPushButton(prop_list[prop_index])
-                text_button.setText("...")
-                text_button.setMaximumWidth(30)
-                layout.addWidget(text_edit)
-                layout.addWidget(text_button)
-                layout.setContentsMargins(0, 0, 0, 0)
-                text_edit.setText(props[key].value)
-                text_edit.textChanged.connect(props[key].set_value)
-                text_edit.textChanged[str].connect(self.current_node.write_attribs)
-                text_edit.textChanged[str].connect(self.current_node.update_item_name)
-                text_edit.textChanged[str].connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                text_edit.editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.WidgetLineEditChangeCommand(
-                            og_values[index],
-                            text_edit.text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != text_edit.text() else None
-                )
-                text_edit.editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: text_edit.text()})
-                )
-                text_button.clicked.connect(lambda _, line_edit_=text_edit: open_plain_editor(line_edit_))
-
-            if type(props[key]) is PropertyFlagLabel:
-                og_values[prop_index] = props[key].value
-                prop_list.append(QLineEdit(self.dockWidgetContents))
-                self.update_flag_label_completer(self.flag_label_model, self._config_root)
-                self.flag_label_completer.activated[str].connect(prop_list[prop_index].setText)
-                prop_list[prop_index].setCompleter(self.flag_label_completer)
-                prop_list[prop_index].textChanged[str].connect(
-                    lambda text: self.update_flag_value_completer(self.flag_value_model, self._config_root, text)
-                )
-                prop_list[prop_index].setText(props[key].value)
-                prop_list[prop_index].textChanged[str].connect(props[key].set_value)
-                prop_list[prop_index].textChanged[str].connect(self.current_node.write_attribs)
-                prop_list[prop_index].textChanged[str].connect(self.current_node.update_item_name)
-                prop_list[prop_index].textChanged[str].connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                prop_list[prop_index].editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.LineEditChangeCommand(
-                            og_values[index],
-                            prop_list[index].text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != prop_list[index].text() else None
-                )
-                prop_list[prop_index].editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: prop_list[index].text()})
-                )
+        node = self.current_node
+        props = node.properties
+        self.property_dispatcher.context = self.PropertyContext(
+            prop_list, og_values, self.node_tree_model, node.model_item, self.select_node, self.undo_stack
+        )
 
-            if type(props[key]) is PropertyFlagValue:
-                og_values[prop_index] = props[key].value
-                prop_list.append(QLineEdit(self.dockWidgetContents))
-                prop_list[prop_index].setCompleter(self.flag_value_completer)
-                self.flag_value_completer.activated[str].connect(prop_list[prop_index].setText)
-                prop_list[prop_index].setText(props[key].value)
-                prop_list[prop_index].textChanged[str].connect(props[key].set_value)
-                prop_list[prop_index].textChanged[str].connect(self.current_node.write_attribs)
-                prop_list[prop_index].textChanged[str].connect(self.current_node.update_item_name)
-                prop_list[prop_index].textChanged[str].connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                prop_list[prop_index].editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.LineEditChangeCommand(
-                            og_values[index],
-                            prop_list[index].text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != prop_list[index].text() else None
-                )
-                prop_list[prop_index].editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: prop_list[index].text()})
-                )
+        # hold off repainting until every row has been added
+        self.dockWidgetContents.setUpdatesEnabled(False)
+        try:
+            for prop in props.values():
+                if not prop.editable:
+                    continue
 
-            elif type(props[key]) is PropertyInt:
-                og_values[prop_index] = props[key].value
-                prop_list.append(QSpinBox(self.dockWidgetContents))
-                prop_list[prop_index].setValue(int(props[key].value))
-                prop_list[prop_index].setMinimum(props[key].min)
-                prop_list[prop_index].setMaximum(props[key].max)
-                prop_list[prop_index].valueChanged.connect(props[key].set_value)
-                prop_list[prop_index].valueChanged.connect(self.current_node.write_attribs)
-                prop_list[prop_index].valueChanged.connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                prop_list[prop_index].valueChanged.connect(
-                    lambda new_value, index=prop_index: self.undo_stack.push(
-                        self.SpinBoxChangeCommand(
-                            og_values[index],
-                            new_value,
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != new_value else None
-                )
-                prop_list[prop_index].valueChanged.connect(
-                    lambda new_value, index=prop_index: og_values.update({index: new_value})
-                )
+                label = QLabel(self.dockWidgetContents)
+                label.setObjectName("label_" + str(prop_index))
+                label.setText(prop.name)
+                self.layout_prop_editor.setWidget(prop_index, QFormLayout.LabelRole, label)
 
-            elif type(props[key]) is PropertyCombo:
-                og_values[prop_index] = props[key].value
-                prop_list.append(QComboBox(self.dockWidgetContents))
-                prop_list[prop_index].insertItems(0, props[key].values)
-                prop_list[prop_index].setCurrentIndex(props[key].values.index(props[key].value))
-                prop_list[prop_index].currentTextChanged.connect(props[key].set_value)
-                prop_list[prop_index].currentTextChanged.connect(self.current_node.write_attribs)
-                prop_list[prop_index].currentTextChanged.connect(self.current_node.update_item_name)
-                prop_list[prop_index].currentTextChanged.connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                prop_list[prop_index].activated[str].connect(
-                    lambda new_value, index=prop_index: self.undo_stack.push(
-                        self.ComboBoxChangeCommand(
-                            og_values[index],
-                            new_value,
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                )
-                prop_list[prop_index].activated[str].connect(
-                    lambda new_value, index=prop_index: og_values.update({index: new_value})
-                )
+                og_values.append(prop.value)
+                widget = self._prop_builders[type(prop)](prop, prop_index, node)
+                widget.setObjectName(str(prop_index))
+                prop_list.append(widget)
 
-            elif type(props[key]) is PropertyFile:
-                def button_clicked(line_edit_):
-                    open_dialog = QFileDialog()
-                    file_path = open_dialog.getOpenFileName(self, "Select File:", self._package_path)
-                    if file_path[0]:
-                        line_edit.setText(relpath(file_path[0], self._package_path))
-                    line_edit_.editingFinished.emit()
-
-                og_values[prop_index] = props[key].value
-                prop_list.append(QWidget(self.dockWidgetContents))
-                layout = QHBoxLayout(prop_list[prop_index])
-                line_edit = QLineEdit(prop_list[prop_index])
-                push_button = QPushButton(prop_list[prop_index])
-                push_button.setText("...")
-                push_button.setMaximumWidth(30)
-                layout.addWidget(line_edit)
-                layout.addWidget(push_button)
-                layout.setContentsMargins(0, 0, 0, 0)
-                line_edit.setText(props[key].value)
-                line_edit.textChanged.connect(props[key].set_value)
-                line_edit.textChanged[str].connect(self.current_node.write_attribs)
-                line_edit.textChanged[str].connect(self.current_node.update_item_name)
-                line_edit.textChanged[str].connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                line_edit.editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.WidgetLineEditChangeCommand(
-                            og_values[index],
-                            line_edit.text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != line_edit.text() else None
-                )
-                line_edit.editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: line_edit.text()})
-                )
-                push_button.clicked.connect(lambda _, line_edit_=line_edit: button_clicked(line_edit_))
-
-            elif type(props[key]) is PropertyFolder:
-                def button_clicked(line_edit_):
-                    open_dialog = QFileDialog()
-                    folder_path = open_dialog.getExistingDirectory(self, "Select folder:", self._package_path)
-                    if folder_path:
-                        line_edit.setText(relpath(folder_path, self._package_path))
-                    line_edit_.editingFinished.emit()
-
-                og_values[prop_index] = props[key].value
-                prop_list.append(QWidget(self.dockWidgetContents))
-                layout = QHBoxLayout(prop_list[prop_index])
-                line_edit = QLineEdit(prop_list[prop_index])
-                push_button = QPushButton(prop_list[prop_index])
-                push_button.setText("...")
-                push_button.setMaximumWidth(30)
-                layout.addWidget(line_edit)
-                layout.addWidget(push_button)
-                layout.setContentsMargins(0, 0, 0, 0)
-                line_edit.setText(props[key].value)
-                line_edit.textChanged.connect(props[key].set_value)
-                line_edit.textChanged.connect(self.current_node.write_attribs)
-                line_edit.textChanged.connect(self.current_node.update_item_name)
-                line_edit.textChanged.connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                line_edit.editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.WidgetLineEditChangeCommand(
-                            og_values[index],
-                            line_edit.text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != line_edit.text() else None
-                )
-                line_edit.editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: line_edit.text()})
-                )
-                push_button.clicked.connect(lambda _, line_edit_=line_edit: button_clicked(line_edit_))
-
-            elif type(props[key]) is PropertyColour:
-                def button_clicked(line_edit_):
-                    init_colour = QColor("#" + props[key].value)
-                    colour_dialog = QColorDialog()
-                    colour = colour_dialog.getColor(init_colour, self, "Choose Colour:")
-                    if colour.isValid():
-                        line_edit.setText(colour.name()[1:])
-                    line_edit_.editingFinished.emit()
-
-                def update_button_colour(text):
-                    colour = QColor("#" + text)
-                    if colour.isValid() and len(text) == 6:
-                        push_button.setStyleSheet("background-color: " + colour.name())
-                        push_button.setIcon(QIcon())
-                    else:
-                        push_button.setStyleSheet("background-color: #ffffff")
-                        icon = QIcon()
-                        icon.addPixmap(QPixmap(join(cur_folder, "resources/logos/logo_danger.png")),
-                                       QIcon.Normal, QIcon.Off)
-                        push_button.setIcon(icon)
-
-                og_values[prop_index] = props[key].value
-                prop_list.append(QWidget(self.dockWidgetContents))
-                layout = QHBoxLayout(prop_list[prop_index])
-                line_edit = QLineEdit(prop_list[prop_index])
-                line_edit.setMaxLength(6)
-                push_button = QPushButton(prop_list[prop_index])
-                push_button.setMinimumHeight(21)
-                push_button.setMinimumWidth(30)
-                push_button.setMaximumHeight(21)
-                push_button.setMaximumWidth(30)
-                layout.addWidget(line_edit)
-                layout.addWidget(push_button)
-                layout.setContentsMargins(0, 0, 0, 0)
-                line_edit.setText(props[key].value)
-                update_button_colour(line_edit.text())
-                line_edit.textChanged.connect(props[key].set_value)
-                line_edit.textChanged.connect(update_button_colour)
-                line_edit.textChanged.connect(self.current_node.write_attribs)
-                line_edit.textChanged.connect(
-                    lambda: self.xml_code_changed.emit(self.current_node)
-                    if self.settings_dict["General"]["code_refresh"] >= 3 else None
-                )
-                line_edit.editingFinished.connect(
-                    lambda index=prop_index: self.undo_stack.push(
-                        self.WidgetLineEditChangeCommand(
-                            og_values[index],
-                            line_edit.text(),
-                            self.current_prop_list,
-                            index,
-                            self.node_tree_model,
-                            self.current_node.model_item,
-                            self.select_node
-                        )
-                    )
-                    if og_values[index] != line_edit.text() else None
-                )
-                line_edit.editingFinished.connect(
-                    lambda index=prop_index: og_values.update({index: line_edit.text()})
-                )
-                push_button.clicked.connect(lambda _, line_edit_=line_edit: button_clicked(line_edit_))
-
-            self.layout_prop_editor.setWidget(prop_index, QFormLayout.FieldRole, prop_list[prop_index])
-            prop_list[prop_index].setObjectName(str(prop_index))
-            prop_index += 1
+                self.layout_prop_editor.setWidget(prop_index, QFormLayout.FieldRole, widget)
+                prop_index += 1
+        finally:
+            self.dockWidgetContents.setUpdatesEnabled(True)
 
     def run_wizard(self):
         """
@@ -1557,8 +1608,9 @@ class SettingsDialog(QDialog, window_settings.Ui_Dialog):
         self.setupUi(self)
 
         self.setWindowFlags(Qt.WindowSystemMenuHint | Qt.WindowTitleHint | Qt.Dialog)
-        self.label_warning_palette.setPixmap(QPixmap(join(cur_folder, "resources/logos/logo_danger.png")))
-        self.label_warning_style.setPixmap(QPixmap(join(cur_folder, "resources/logos/logo_danger.png")))
+        danger_pixmap = QPixmap(_LOGO_DANGER)
+        self.label_warning_palette.setPixmap(danger_pixmap)
+        self.label_warning_style.setPixmap(danger_pixmap)
         self.widget_warning_palette.hide()
         self.widget_warning_style.hide()
         self.settings_dict = read_settings()
@@ -1576,42 +1628,19 @@ class SettingsDialog(QDialog, window_settings.Ui_Dialog):
         self.check_type.stateChanged.connect(self.combo_type.setEnabled)
         self.check_defaultType.stateChanged.connect(self.combo_defaultType.setEnabled)
 
-        self.button_colour_required.clicked.connect(
-            lambda: self.button_colour_required.setStyleSheet(
-                "background-color: " + QColorDialog().getColor(
-                    QColor(self.button_colour_required.styleSheet().split()[1]),
-                    self,
-                    "Choose Colour:"
-                ).name()
-            )
-        )
-        self.button_colour_atleastone.clicked.connect(
-            lambda: self.button_colour_atleastone.setStyleSheet(
-                "background-color: " + QColorDialog().getColor(
-                    QColor(self.button_colour_atleastone.styleSheet().split()[1]),
-                    self,
-                    "Choose Colour:"
-                ).name()
-            )
-        )
-        self.button_colour_either.clicked.connect(
-            lambda: self.button_colour_either.setStyleSheet(
-                "background-color: " + QColorDialog().getColor(
-                    QColor(self.button_colour_either.styleSheet().split()[1]),
-                    self,
-                    "Choose Colour:"
-                ).name()
-            )
-        )
-        self.button_colour_reset_required.clicked.connect(
-            lambda: self.button_colour_required.setStyleSheet("background-color: #d90027")
-        )
-        self.button_colour_reset_atleastone.clicked.connect(
-            lambda: self.button_colour_atleastone.setStyleSheet("background-color: #d0d02e")
-        )
-        self.button_colour_reset_either.clicked.connect(
-            lambda: self.button_colour_either.setStyleSheet("background-color: #ffaa7f")
-        )
+        # the chosen colours are kept here, the buttons' stylesheets only display them
+        self._colours = {}
+        self._colour_buttons = {
+            "required": self.button_colour_required,
+            "atleastone": self.button_colour_atleastone,
+            "either": self.button_colour_either,
+        }
+        self.button_colour_required.clicked.connect(partial(self._choose_colour, "required"))
+        self.button_colour_atleastone.clicked.connect(partial(self._choose_colour, "atleastone"))
+        self.button_colour_either.clicked.connect(partial(self._choose_colour, "either"))
+        self.button_colour_reset_required.clicked.connect(partial(self._set_colour, "required", "#d90027"))
+        self.button_colour_reset_atleastone.clicked.connect(partial(self._set_colour, "atleastone", "#d0d02e"))
+        self.button_colour_reset_either.clicked.connect(partial(self._set_colour, "either", "#ffaa7f"))
         self.combo_style.currentTextChanged.connect(
             lambda text: self.widget_warning_style.show()
             if text != self.settings_dict["Appearance"]["style"]
@@ -1651,15 +1680,8 @@ class SettingsDialog(QDialog, window_settings.Ui_Dialog):
         self.combo_defaultType.setEnabled(self.settings_dict["Defaults"]["defaultType"].enabled())
         self.combo_defaultType.setCurrentText(self.settings_dict["Defaults"]["defaultType"].value())
 
-        self.button_colour_required.setStyleSheet(
-            "background-color: " + self.settings_dict["Appearance"]["required_colour"]
-        )
-        self.button_colour_atleastone.setStyleSheet(
-            "background-color: " + self.settings_dict["Appearance"]["atleastone_colour"]
-        )
-        self.button_colour_either.setStyleSheet(
-            "background-color: " + self.settings_dict["Appearance"]["either_colour"]
-        )
+        for key in self._colour_buttons:
+            self._set_colour(key, self.settings_dict["Appearance"][key + "_colour"])
         if self.settings_dict["Appearance"]["style"]:
             self.combo_style.setCurrentText(self.settings_dict["Appearance"]["style"])
         else:
@@ -1669,6 +1691,21 @@ class SettingsDialog(QDialog, window_settings.Ui_Dialog):
         else:
             self.combo_palette.setCurrentText("Default")
 
+    def _set_colour(self, key, colour):
+        """
+        Stores the colour under key and shows it on the matching button.
+
+        :param key: The colour's key in _colours - "required", "atleastone" or "either".
+        :param colour: The colour's hex name, including the leading "#".
+        """
+        self._colours[key] = colour
+        self._colour_buttons[key].setStyleSheet("background-color: " + colour)
+
+    def _choose_colour(self, key):
+        colour = QColorDialog.getColor(QColor(self._colours[key]), self, "Choose Colour:")
+        if colour.isValid():
+            self._set_colour(key, colour.name())
+
     def accepted(self):
         self.settings_dict["General"]["code_refresh"] = self.combo_code_refresh.currentIndex()
         self.settings_dict["General"]["show_intro"] = self.check_intro.isChecked()
@@ -1697,9 +1734,8 @@ class SettingsDialog(QDialog, window_settings.Ui_Dialog):
         self.settings_dict["Defaults"]["defaultType"].set_enabled(self.check_defaultType.isChecked())
         self.settings_dict["Defaults"]["defaultType"].set_value(self.combo_defaultType.currentText())
 
-        self.settings_dict["Appearance"]["required_colour"] = self.button_colour_required.styleSheet().split()[1]
-        self.settings_dict["Appearance"]["atleastone_colour"] = self.button_colour_atleastone.styleSheet().split()[1]
-        self.settings_dict["Appearance"]["either_colour"] = self.button_colour_either.styleSheet().split()[1]
+        for key, colour in self._colours.items():
+            self.settings_dict["Appearance"][key + "_colour"] = colour
         if self.combo_style.currentText() != "Default":
             self.settings_dict["Appearance"]["style"] = self.combo_style.currentText()
         else:
@@ -1709,8 +1745,8 @@ class SettingsDialog(QDialog, window_settings.Ui_Dialog):
         else:
             self.settings_dict["Appearance"]["palette"] = ""
 
-        makedirs(join(expanduser("~"), ".fomod"), exist_ok=True)
-        with open(join(expanduser("~"), ".fomod", ".designer"), "w") as configfile:
+        makedirs(_FOMOD_DIR, exist_ok=True)
+        with open(_DESIGNER_FILE, "w") as configfile:
             set_encoder_options("json", indent=4)
             configfile.write(encode(self.settings_dict))
 
@@ -1768,6 +1804,9 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
         def set_priority(self, value):
             self.priority = value
 
+    # how many decoded preview images are kept around
+    pixmap_cache_size = 32
+
     def __init__(self, mo_preview_layout):
         super().__init__()
         self.mo_preview_layout = mo_preview_layout
@@ -1777,8 +1816,42 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
         self.splitter_label.addWidget(self.label_image)
         self.hide()
 
-        self.button_preview_more.setIcon(QIcon(join(cur_folder, "resources/logos/logo_more.png")))
-        self.button_preview_less.setIcon(QIcon(join(cur_folder, "resources/logos/logo_less.png")))
+        self._pixmap_cache = OrderedDict()
+
+        # the placeholder labels are only created the first time they're needed
+        self.label_invalid = None
+        self.label_missing = None
+
+        # the current page's plugin buttons, in page order
+        self._preview_buttons = []
+        # which of those buttons were checked when the results were last built
+        self._refreshed_state = None
+
+        self.clear_tab_signal.connect(self.clear_tab)
+        self.clear_ui_signal.connect(self.clear_ui)
+        self.invalid_node_signal.connect(self.invalid_node)
+        self.missing_node_signal.connect(self.missing_node)
+        self.set_labels_signal.connect(self.set_labels)
+        self.create_page_signal.connect(self.create_page)
+
+        # the models, icons and button wiring aren't needed until the preview is first used,
+        # so let the main window paint before setting them up
+        self._init_done = False
+        QTimer.singleShot(0, self._deferred_init)
+
+    def _deferred_init(self):
+        """
+        Finishes setting up the widget. Runs once, either from the timer scheduled in __init__
+        or from the first slot that needs it, whichever comes first.
+        """
+        if self._init_done:
+            return
+        self._init_done = True
+
+        more_icon = QIcon(_LOGO_MORE)
+        less_icon = QIcon(_LOGO_LESS)
+        self.button_preview_more.setIcon(more_icon)
+        self.button_preview_less.setIcon(less_icon)
         self.button_preview_more.clicked.connect(self.button_preview_more.hide)
         self.button_preview_more.clicked.connect(self.button_preview_less.show)
         self.button_preview_more.clicked.connect(self.widget_preview.show)
@@ -1786,8 +1859,8 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
         self.button_preview_less.clicked.connect(self.button_preview_more.show)
         self.button_preview_less.clicked.connect(self.widget_preview.hide)
         self.button_preview_more.clicked.emit()
-        self.button_results_more.setIcon(QIcon(join(cur_folder, "resources/logos/logo_more.png")))
-        self.button_results_less.setIcon(QIcon(join(cur_folder, "resources/logos/logo_less.png")))
+        self.button_results_more.setIcon(more_icon)
+        self.button_results_less.setIcon(less_icon)
         self.button_results_more.clicked.connect(self.button_results_more.hide)
         self.button_results_more.clicked.connect(self.button_results_less.show)
         self.button_results_more.clicked.connect(self.widget_results.show)
@@ -1796,50 +1869,30 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
         self.button_results_less.clicked.connect(self.widget_results.hide)
         self.button_results_less.clicked.emit()
 
+        # the headers keep their sections stretched on their own, through model resets and expansions
         self.model_files = QStandardItemModel()
-        self.tree_results.expanded.connect(
-            lambda: self.tree_results.header().resizeSections(QHeaderView.Stretch)
-        )
-        self.tree_results.collapsed.connect(
-            lambda: self.tree_results.header().resizeSections(QHeaderView.Stretch)
-        )
+        self.tree_results.header().setSectionResizeMode(QHeaderView.Stretch)
+        self.expand_icon = QIcon(_LOGO_EXPAND)
+        self.collapse_icon = QIcon(_LOGO_COLLAPSE)
+        self.folder_icon = QIcon(_LOGO_FOLDER)
+        self.file_icon = QIcon(_LOGO_FILE)
         self.tree_results.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree_results.customContextMenuRequested.connect(self.on_custom_context_menu)
         self.model_flags = QStandardItemModel()
-        self.list_flags.expanded.connect(
-            lambda: self.list_flags.header().resizeSections(QHeaderView.Stretch)
-        )
-        self.list_flags.collapsed.connect(
-            lambda: self.list_flags.header().resizeSections(QHeaderView.Stretch)
-        )
+        self.list_flags.header().setSectionResizeMode(QHeaderView.Stretch)
         self.reset_models()
 
-        self.label_invalid = QLabel(
-            "Select an Installation Step node or one of its children to preview its installer page."
-        )
-        self.label_invalid.setAlignment(Qt.AlignCenter)
-        self.mo_preview_layout.addWidget(self.label_invalid)
-        self.label_invalid.hide()
-
-        self.label_missing = QLabel(
-            "In order to preview an installer page, create an Installation Step node."
-        )
-        self.label_missing.setAlignment(Qt.AlignCenter)
-        self.mo_preview_layout.addWidget(self.label_missing)
-        self.label_missing.hide()
-
-        self.clear_tab_signal.connect(self.clear_tab)
-        self.clear_ui_signal.connect(self.clear_ui)
-        self.invalid_node_signal.connect(self.invalid_node)
-        self.missing_node_signal.connect(self.missing_node)
-        self.set_labels_signal.connect(self.set_labels)
-        self.create_page_signal.connect(self.create_page)
+        # a radio group toggles two buttons per click, coalesce their refreshes into one
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self.refresh_results)
 
     def on_custom_context_menu(self, position):
         node_tree_context_menu = QMenu(self.tree_results)
 
-        action_expand = QAction(QIcon(join(cur_folder, "resources/logos/logo_expand.png")), "Expand All", self)
-        action_collapse = QAction(QIcon(join(cur_folder, "resources/logos/logo_collapse.png")), "Collapse All", self)
+        action_expand = QAction(self.expand_icon, "Expand All", self)
+        action_collapse = QAction(self.collapse_icon, "Collapse All", self)
 
         action_expand.triggered.connect(self.tree_results.expandAll)
         action_collapse.triggered.connect(self.tree_results.collapseAll)
@@ -1852,48 +1905,84 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
     def eventFilter(self, object_, event):
         if event.type() == QEvent.HoverEnter:
             self.label_description.setText(object_.property("description"))
-            self.label_image.set_scalable_pixmap(QPixmap(object_.property("image_path")))
+            self.label_image.set_scalable_pixmap(self._load_pixmap(object_.property("image_path")))
+
+        return super().eventFilter(object_, event)
+
+    def _load_pixmap(self, path):
+        """
+        Returns the pixmap for path, decoding it only if it isn't one of the most recently used.
 
-        return QWidget().eventFilter(object_, event)
+        :param path: The image's path.
+        """
+        pixmap = self._pixmap_cache.pop(path, None)
+        if pixmap is None:
+            pixmap = QPixmap(path)
+            if len(self._pixmap_cache) >= self.pixmap_cache_size:
+                self._pixmap_cache.popitem(last=False)
+        self._pixmap_cache[path] = pixmap
+        return pixmap
 
     def clear_ui(self):
+        self._deferred_init()
         self.label_name.clear()
         self.label_author.clear()
         self.label_version.clear()
         self.label_website.clear()
         self.label_description.clear()
         self.label_image.clear()
-        [widget.deleteLater() for widget in [
-            self.layout_widget.itemAt(index).widget() for index in range(self.layout_widget.count())
-            if self.layout_widget.itemAt(index).widget()
-            ]]
+        for index in reversed(range(self.layout_widget.count())):
+            widget = self.layout_widget.takeAt(index).widget()
+            if widget is not None:
+                widget.deleteLater()
+        self._preview_buttons.clear()
         self.reset_models()
 
     def reset_models(self):
         self.model_files.clear()
         self.model_files.setHorizontalHeaderLabels(["Files Preview", "Source", "Plugin"])
-        self.model_files_root = QStandardItem(QIcon(join(cur_folder, "resources/logos/logo_folder.png")), "<root>")
+        self.model_files_root = QStandardItem(self.folder_icon, "<root>")
         self.model_files.appendRow(self.model_files_root)
+        # every item in the files preview keyed by its path, as a tuple of names, below the root
+        self._path_index = {(): self.model_files_root}
         self.tree_results.setModel(self.model_files)
         self.model_flags.clear()
         self.model_flags.setHorizontalHeaderLabels(["Flag Label", "Flag Value", "Plugin"])
         self.list_flags.setModel(self.model_flags)
 
     def clear_tab(self):
+        self._deferred_init()
         for index in reversed(range(self.mo_preview_layout.count())):
             widget = self.mo_preview_layout.itemAt(index).widget()
             if widget is not None:
                 widget.hide()
 
+    def _create_placeholder_label(self, text):
+        label = QLabel(text)
+        label.setAlignment(Qt.AlignCenter)
+        self.mo_preview_layout.addWidget(label)
+        return label
+
     def invalid_node(self):
+        self._deferred_init()
         self.clear_tab()
+        if self.label_invalid is None:
+            self.label_invalid = self._create_placeholder_label(
+                "Select an Installation Step node or one of its children to preview its installer page."
+            )
         self.label_invalid.show()
 
     def missing_node(self):
+        self._deferred_init()
         self.clear_tab()
+        if self.label_missing is None:
+            self.label_missing = self._create_placeholder_label(
+                "In order to preview an installer page, create an Installation Step node."
+            )
         self.label_missing.show()
 
     def set_labels(self, name, author, version, website):
+        self._deferred_init()
         self.label_name.setText(name)
         self.label_author.setText(author)
         self.label_version.setText(version)
@@ -1901,15 +1990,20 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
 
     # this is pretty horrendous, need to come up with a better way of doing this.
     def create_page(self, page_data):
+        self._deferred_init()
         group_step = QGroupBox(page_data.name)
         layout_step = QVBoxLayout()
         group_step.setLayout(layout_step)
 
+        # buttons that start checked, they're only checked once the whole page is laid out
+        to_check = []
         check_first_radio = True
         for group in page_data.group_list:
             group_group = QGroupBox(group.name)
             layout_group = QVBoxLayout()
             group_group.setLayout(layout_group)
+            # shared by the group's buttons, see _at_least_one_toggled
+            checked_count = [0]
 
             for plugin in group.plugin_list:
                 if group.type in ["SelectAny", "SelectAll", "SelectAtLeastOne"]:
@@ -1920,20 +2014,13 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
                         button_plugin.setEnabled(False)
                     elif group.type == "SelectAtLeastOne":
                         button_plugin.toggled.connect(
-                            lambda checked, button=button_plugin: button.setChecked(True)
-                            if not checked and not [
-                                button for button in [
-                                    layout_group.itemAt(index).widget() for index in range(layout_group.count())
-                                    if layout_group.itemAt(index).widget()
-                                ] if button.isChecked()
-                            ]
-                            else None
+                            partial(self._at_least_one_toggled, button_plugin, checked_count), Qt.DirectConnection
                         )
 
                 elif group.type in ["SelectExactlyOne", "SelectAtMostOne"]:
                     button_plugin = QRadioButton(plugin.name, self)
                     if check_first_radio and not button_plugin.isChecked():
-                        button_plugin.animateClick(0)
+                        to_check.append(button_plugin)
                         check_first_radio = False
 
                 button_plugin.setProperty("description", plugin.description)
@@ -1947,18 +2034,17 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
                 if plugin.type == "Required":
                     button_plugin.setEnabled(False)
                 elif plugin.type == "Recommended":
-                    button_plugin.animateClick(0) if not button_plugin.isChecked() else None
+                    to_check.append(button_plugin) if not button_plugin.isChecked() else None
                 elif plugin.type == "NotUsable":
                     button_plugin.setChecked(False)
                     button_plugin.setEnabled(False)
 
-                button_plugin.toggled.connect(self.reset_models)
-                button_plugin.toggled.connect(self.update_installed_files)
-                button_plugin.toggled.connect(self.update_set_flags)
+                # the page's buttons and their slots all live in the gui thread
+                button_plugin.toggled.connect(lambda: self._refresh_timer.start(), Qt.DirectConnection)
 
                 button_plugin.installEventFilter(self)
-                button_plugin.setObjectName("preview_button")
                 layout_group.addWidget(button_plugin)
+                self._preview_buttons.append(button_plugin)
 
             if group.type == "SelectAtMostOne":
                 button_none = QRadioButton("None")
@@ -1967,151 +2053,197 @@ class PreviewMoGui(QWidget, preview_mo.Ui_Form):
             layout_step.addWidget(group_group)
 
         self.layout_widget.addWidget(group_step)
+
+        # the radio buttons are only exclusive once they're in their group box.
+        # any refresh queued by these toggles is cancelled by the one below
+        for button in to_check:
+            if button.isEnabled():
+                button.setChecked(True)
+        self._refreshed_state = None
+        self.refresh_results()
+        self.show()
+
+    @staticmethod
+    def _at_least_one_toggled(button, checked_count, checked):
+        """
+        Keeps at least one button of a SelectAtLeastOne group checked.
+
+        :param button: The button that was toggled.
+        :param checked_count: A single item list holding how many of the group's buttons are checked.
+        :param checked: The button's new state.
+        """
+        checked_count[0] += 1 if checked else -1
+        if not checked and not checked_count[0]:
+            button.setChecked(True)
+
+    def refresh_results(self):
+        """
+        Rebuilds the installed files and set flags previews from the current selection.
+        Does nothing if the selection hasn't changed since the last rebuild.
+        """
+        self._refresh_timer.stop()
+        state = tuple(button.isChecked() for button in self._preview_buttons)
+        if state == self._refreshed_state:
+            return
+        self._refreshed_state = state
         self.reset_models()
         self.update_installed_files()
         self.update_set_flags()
-        self.show()
 
     def update_installed_files(self):
-        def recurse_add_items(folder, parent):
-            for boop in listdir(folder):  # I was very tired
-                if isdir(join(folder, boop)):
-                    folder_item = None
-                    existing_folder_ = self.model_files.findItems(boop, Qt.MatchRecursive)
-                    if existing_folder_:
-                        for boopity in existing_folder_:
-                            if boopity.parent() is parent:
-                                folder_item = boopity
-                                break
+        # don't repaint the tree for every row added
+        self.tree_results.setUpdatesEnabled(False)
+        try:
+            self._add_installed_files()
+        finally:
+            self.tree_results.setUpdatesEnabled(True)
+
+    def _add_installed_files(self):
+        path_index = self._path_index
+
+        def destination_parts(destination):
+            """
+            Splits a normalized destination into its folder names - "." is the root and has none.
+            """
+            path = PurePath(destination)
+            return path.parts[1:] if path.anchor else path.parts
+
+        def remove_path(path):
+            """
+            Removes the item at path from the model and forgets it and everything below it.
+            """
+            item = path_index.pop(path)
+            # only folders have anything indexed below them, overridden files are the common case
+            if item.hasChildren():
+                for key in [key for key in path_index if key[:len(path)] == path]:
+                    del path_index[key]
+            item.parent().removeRow(item.row())
+
+        def recurse_add_items(folder, parent, parent_path):
+            # scandir's entries already know their type so there's no extra stat per entry
+            for entry in scandir(folder):
+                boop = entry.name
+                path = parent_path + (boop,)
+                if entry.is_dir():
+                    folder_item = path_index.get(path)
                     if not folder_item:
                         folder_item = self.PreviewItem(
-                            QIcon(join(cur_folder, "resources/logos/logo_folder.png")),
+                            self.folder_icon,
                             boop
                         )
                         folder_item.set_priority(folder_.priority)
-                        parent.appendRow([folder_item, QStandardItem(rel_source), QStandardItem(button.text())])
-                    recurse_add_items(join(folder, boop), folder_item)
+                        parent.appendRow([folder_item, QStandardItem(rel_source), QStandardItem(button_text)])
+                        path_index[path] = folder_item
+                    recurse_add_items(entry.path, folder_item, path)
 
-                elif isfile(join(folder, boop)):
+                elif entry.is_file():
                     file_item_ = None
-                    existing_file_ = self.model_files.findItems(boop, Qt.MatchRecursive)
+                    existing_file_ = path_index.get(path)
                     if existing_file_:
-                        for boopity in existing_file_:
-                            if boopity.parent() is parent:
-                                if folder_.priority < boopity.priority:
-                                    file_item_ = boopity
-                                    break
-                                else:
-                                    parent.removeRow(boopity.row())
-                                    break
+                        if folder_.priority < existing_file_.priority:
+                            file_item_ = existing_file_
+                        else:
+                            remove_path(path)
                     if not file_item_:
                         file_item_ = self.PreviewItem(
-                            QIcon(join(cur_folder, "resources/logos/logo_file.png")),
+                            self.file_icon,
                             boop
                         )
                         file_item_.set_priority(folder_.priority)
-                        parent.appendRow([file_item_, QStandardItem(rel_source), QStandardItem(button.text())])
-
-        for button in self.findChildren((QCheckBox, QRadioButton), "preview_button"):
+                        parent.appendRow([file_item_, QStandardItem(rel_source), QStandardItem(button_text)])
+                        path_index[path] = file_item_
+
+        for button in self._preview_buttons:
+            # read everything needed from the button once, each property() call goes through a QVariant
+            button_type = button.property("type")
+            button_text = button.text()
+            usable = button_type != "NotUsable"
+            # installed regardless of each file's own flags
+            install_all = button.isChecked() and usable or button_type == "Required"
             for folder_ in button.property("folder_list"):
-                if (button.isChecked() and button.property("type") != "NotUsable" or
-                        folder_.always_install or
-                        folder_.install_usable and button.property("type") != "NotUsable" or
-                        button.property("type") == "Required"):
+                if install_all or folder_.always_install or folder_.install_usable and usable:
                     destination = folder_.destination
                     abs_source = folder_.abs_source
                     rel_source = folder_.rel_source
                     parent_item = self.model_files_root
+                    parent_path = ()
 
-                    destination_split = destination.split("/")
-                    if destination_split[0] == ".":
-                        destination_split = destination_split[1:]
-                    for dest_folder in destination_split:
-                        existing_folder_list = self.model_files.findItems(dest_folder, Qt.MatchRecursive)
-                        if existing_folder_list:
-                            for existing_folder in existing_folder_list:
-                                if existing_folder.parent() is parent_item:
-                                    parent_item = existing_folder
-                                    break
+                    for dest_folder in destination_parts(destination):
+                        parent_path += (dest_folder,)
+                        existing_folder = path_index.get(parent_path)
+                        if existing_folder:
+                            parent_item = existing_folder
                             continue
                         item_ = self.PreviewItem(
-                            QIcon(join(cur_folder, "resources/logos/logo_folder.png")),
+                            self.folder_icon,
                             dest_folder
                         )
                         item_.set_priority(folder_.priority)
-                        parent_item.appendRow([item_, QStandardItem(), QStandardItem(button.text())])
+                        parent_item.appendRow([item_, QStandardItem(), QStandardItem(button_text)])
+                        path_index[parent_path] = item_
                         parent_item = item_
 
                     if isdir(abs_source):
-                        recurse_add_items(abs_source, parent_item)
+                        recurse_add_items(abs_source, parent_item, parent_path)
 
             for file_ in button.property("file_list"):
-                if (button.isChecked() and button.property("type") != "NotUsable" or
-                        file_.always_install or
-                        file_.install_usable and button.property("type") != "NotUsable" or
-                        button.property("type") == "Required"):
+                if install_all or file_.always_install or file_.install_usable and usable:
                     destination = file_.destination
                     abs_source = file_.abs_source
                     rel_source = file_.rel_source
                     parent_item = self.model_files_root
+                    parent_path = ()
 
-                    destination_split = destination.split("/")
-                    if destination_split[0] == ".":
-                        destination_split = destination_split[1:]
-                    for dest_folder in destination_split:
-                        existing_folder_list = self.model_files.findItems(dest_folder, Qt.MatchRecursive)
-                        if existing_folder_list:
-                            for existing_folder in existing_folder_list:
-                                if existing_folder.parent() is parent_item:
-                                    parent_item = existing_folder
-                                    break
+                    for dest_folder in destination_parts(destination):
+                        parent_path += (dest_folder,)
+                        existing_folder = path_index.get(parent_path)
+                        if existing_folder:
+                            parent_item = existing_folder
                             continue
                         item_ = self.PreviewItem(
-                            QIcon(join(cur_folder, "resources/logos/logo_folder.png")),
+                            self.folder_icon,
                             dest_folder
                         )
                         item_.set_priority(file_.priority)
-                        parent_item.appendRow([item_, QStandardItem(), QStandardItem(button.text())])
+                        parent_item.appendRow([item_, QStandardItem(), QStandardItem(button_text)])
+                        path_index[parent_path] = item_
                         parent_item = item_
 
-                    source_file = abs_source.split("/")[len(abs_source.split("/")) - 1]
+                    source_file = basename(abs_source)
+                    file_path = parent_path + (source_file,)
                     file_item = None
-                    existing_file_list = self.model_files.findItems(source_file, Qt.MatchRecursive)
-                    if existing_file_list:
-                        for existing_file in existing_file_list:
-                            if existing_file.parent() is parent_item:
-                                if file_.priority < existing_file.priority:
-                                    file_item = existing_file
-                                    break
-                                else:
-                                    parent_item.removeRow(existing_file.row())
-                                    break
+                    existing_file = path_index.get(file_path)
+                    if existing_file:
+                        if file_.priority < existing_file.priority:
+                            file_item = existing_file
+                        else:
+                            remove_path(file_path)
                     if not file_item:
                         file_item = self.PreviewItem(
-                            QIcon(join(cur_folder, "resources/logos/logo_file.png")),
+                            self.file_icon,
                             source_file
                         )
                         file_item.set_priority(file_.priority)
-                        parent_item.appendRow([file_item, QStandardItem(rel_source), QStandardItem(button.text())])
-
-        self.tree_results.header().resizeSections(QHeaderView.Stretch)
+                        parent_item.appendRow([file_item, QStandardItem(rel_source), QStandardItem(button_text)])
+                        path_index[file_path] = file_item
 
     def update_set_flags(self):
-        for button in self.findChildren((QCheckBox, QRadioButton), "preview_button"):
+        # each flag label's row, so a repeated flag doesn't need a search through the model
+        flag_rows = {self.model_flags.item(row).text(): row for row in range(self.model_flags.rowCount())}
+        for button in self._preview_buttons:
             if button.isChecked():
+                button_text = button.text()
                 for flag in button.property("flag_list"):
-                    flag_label = QStandardItem(flag.label)
                     flag_value = QStandardItem(flag.value)
-                    flag_plugin = QStandardItem(button.text())
-                    existing_flag = self.model_flags.findItems(flag.label)
-                    if existing_flag:
-                        previous_flag_row = existing_flag[0].row()
-                        self.model_flags.removeRow(previous_flag_row)
-                        self.model_flags.insertRow(previous_flag_row, [flag_label, flag_value, flag_plugin])
+                    flag_plugin = QStandardItem(button_text)
+                    previous_flag_row = flag_rows.get(flag.label)
+                    if previous_flag_row is not None:
+                        # overwrite the cells in place, the label stays the same
+                        self.model_flags.setItem(previous_flag_row, 1, flag_value)
+                        self.model_flags.setItem(previous_flag_row, 2, flag_plugin)
                     else:
-                        self.model_flags.appendRow([flag_label, flag_value, flag_plugin])
-
-        self.list_flags.header().resizeSections(QHeaderView.Stretch)
+                        flag_rows[flag.label] = self.model_flags.rowCount()
+                        self.model_flags.appendRow([QStandardItem(flag.label), flag_value, flag_plugin])
 
 
 class DefaultsSettings(object):
@@ -2194,6 +2326,21 @@ def generic_errorbox(title, text, detail=""):
     return errorbox
 
 
+def version_tuple(version):
+    """
+    Converts a version string into a tuple of integers so versions compare numerically ("10.0" > "2.0").
+    Any non-numeric suffix in a component (e.g. "0-beta") is ignored.
+
+    :param version: The version string, without any leading "v".
+    :return: The tuple of integer components.
+    """
+    components = []
+    for component in version.split("."):
+        digits = re_match(r"\d*", component).group()
+        components.append(int(digits) if digits else 0)
+    return tuple(components)
+
+
 def read_settings():
     """
     Reads the settings from the ~/.fomod/.designer file. If such a file does not exist it uses the default settings.
@@ -2216,7 +2363,7 @@ def read_settings():
         return a
 
     try:
-        with open(join(expanduser("~"), ".fomod", ".designer"), "r") as configfile:
+        with open(_DESIGNER_FILE, "r") as configfile:
             settings_dict = decode(configfile.read())
         deep_merge(default_settings, settings_dict)
         return default_settings
@@ -40,6 +40,9 @@ class NodeComment(etree.CommentBase):
         self.sort_order = "0"
         self.user_sort_order = "0".zfill(7)
         self.allowed_children = ()
+        self.required_children = frozenset()
+        self.either_children_group = frozenset()
+        self.at_least_one_children_group = frozenset()
         self.allowed_instances = 0
         self.wizard = None
         self.name = "Comment"
@@ -110,9 +113,10 @@ class _NodeElement(etree.ElementBase):
         self.sort_order = sort_order
         self.properties = properties
         self.allowed_children = allowed_children
-        self.required_children = required_children
-        self.either_children_group = either_children_group
-        self.at_least_one_children_group = at_least_one_children_group
+        self._allowed_add_set = frozenset(allowed_children)
+        self.required_children = frozenset(required_children)
+        self.either_children_group = frozenset(either_children_group)
+        self.at_least_one_children_group = frozenset(at_least_one_children_group)
         self.hidden_children = []
         self.is_hidden = False
         self.allowed_instances = allowed_instances
@@ -142,7 +146,7 @@ class _NodeElement(etree.ElementBase):
                     instances += 1
             if instances >= child.allowed_instances:
                 return False
-        if type(child) in self.allowed_children or child.tag is etree.Comment:
+        if type(child) in self._allowed_add_set or child.tag is etree.Comment:
             return True
         return False
 
@@ -62,9 +62,10 @@ class PropertyCombo(_PropertyBase):
     def __init__(self, name, values, editable=True):
         super().__init__(name, values, editable)
         self.value = values[0]
+        self.value_index = {value: index for index, value in enumerate(values)}
 
     def set_value(self, value):
-        if value in self.values:
+        if value in self.value_index:
             super().set_value(value)
 
 
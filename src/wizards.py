@@ -128,13 +128,12 @@ class WizardFiles(_WizardBase):
         :return: base QWidget, with the source and destination fields built
         """
         def button_clicked():
-            open_dialog = QFileDialog()
             if element.tag == "file":
-                file_path = open_dialog.getOpenFileName(self, "Select File:", self.kwargs["package_path"])
+                file_path = QFileDialog.getOpenFileName(self, "Select File:", self.kwargs["package_path"])
                 if file_path[0]:
                     item_ui.edit_source.setText(relpath(file_path[0], self.kwargs["package_path"]))
             elif element.tag == "folder":
-                folder_path = open_dialog.getExistingDirectory(self, "Select folder:", self.kwargs["package_path"])
+                folder_path = QFileDialog.getExistingDirectory(self, "Select folder:", self.kwargs["package_path"])
                 if folder_path:
                     item_ui.edit_source.setText(relpath(folder_path, self.kwargs["package_path"]))
 
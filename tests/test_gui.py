@@ -16,19 +16,22 @@
 
 import sys
 import os
+from shutil import copytree
 from datetime import datetime
 from copy import deepcopy
 from io import StringIO
 from unittest.mock import patch, Mock
 from jsonpickle import encode, decode
+from lxml.etree import parse
 from requests import codes
 from json import JSONDecodeError
-from PyQt5.QtWidgets import QDialogButtonBox, QMessageBox
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QDialogButtonBox, QMessageBox, QLineEdit, QWidget, QVBoxLayout
+from PyQt5.QtCore import Qt, QItemSelectionModel
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src import __version__
 from src.gui import About, read_settings, default_settings, SettingsDialog, generic_errorbox, IntroWindow, \
-    MainFrame
+    MainFrame, version_tuple, PreviewMoGui
+from src.previews import PreviewGuiWorker
 
 
 def test_about_dialog(qtbot):
@@ -81,6 +84,13 @@ def test_errorbox(qtbot):
     assert not errorbox.isVisible()
 
 
+def test_version_tuple():
+    assert version_tuple("0.8.1") == (0, 8, 1)
+    assert version_tuple("10.0") > version_tuple("2.0")
+    assert version_tuple("0.8.1") <= version_tuple("0.8.1.0")
+    assert version_tuple("0.9.0-beta") > version_tuple("0.8.1.0")
+
+
 @patch('src.gui.open')
 def test_read_settings(mock_open):
     mock_open.return_value = StringIO(encode(default_settings))
@@ -203,3 +213,62 @@ def test_mainframe(qtbot):
     assert main_window.isVisible()
 
     # TODO: actually test this class
+
+
+@patch("src.gui.read_settings")
+def test_mainframe_save_sorts_modified_trees(mock_read_settings, qtbot, tmpdir):
+    settings_dict = deepcopy(default_settings)
+    for section in ("Load", "Save"):
+        settings_dict[section]["validate"] = False
+        settings_dict[section]["warnings"] = False
+    mock_read_settings.return_value = settings_dict
+    package_path = str(tmpdir)
+    copytree(
+        os.path.join(os.path.dirname(__file__), "data", "valid_fomod", "fomod"),
+        os.path.join(package_path, "fomod")
+    )
+    main_window = MainFrame()
+    qtbot.addWidget(main_window)
+    main_window.open(package_path)
+    model = main_window.node_tree_model
+
+    # drag moduleName to the end of config, the drop itself doesn't go through the undo stack
+    config_item = main_window.config_root().model_item
+    mime_data = model.mimeData([model.indexFromItem(config_item.child(0))])
+    assert model.dropMimeData(mime_data, Qt.MoveAction, -1, 0, model.indexFromItem(config_item))
+
+    # then edit the info tree
+    main_window.select_node.emit(model.indexFromItem(main_window.info_root().model_item.child(0)))
+    line_edit = main_window.current_prop_list[0].findChild(QLineEdit)
+    line_edit.setText("Changed")
+    line_edit.editingFinished.emit()
+
+    main_window.save()
+    config_tags = [elem.tag for elem in parse(os.path.join(package_path, "fomod", "ModuleConfig.xml")).getroot()]
+    assert config_tags[0] == "moduleName"
+
+
+def test_preview_refresh_keeps_selection_models(qtbot, tmpdir):
+    package_path = str(tmpdir)
+    step = PreviewGuiWorker.InstallStepData("step")
+    group = PreviewGuiWorker.GroupData("group", "SelectAny")
+    group.set_plugin_list([
+        PreviewGuiWorker.PluginData(
+            "plugin", "", "",
+            [PreviewGuiWorker.FileData(os.path.join(package_path, "file.esp"), "file.esp", "data", "0", None, None)],
+            [], [PreviewGuiWorker.FlagData("flag", "on")], "Optional"
+        )
+    ])
+    step.set_group_list([group])
+    container = QWidget()
+    qtbot.addWidget(container)
+    preview = PreviewMoGui(QVBoxLayout(container))
+    preview.create_page(step)
+    selection_models = len(preview.tree_results.findChildren(QItemSelectionModel))
+
+    plugin_button = preview._preview_buttons[0]
+    for _ in range(10):
+        plugin_button.toggle()
+        preview.refresh_results()
+
+    assert len(preview.tree_results.findChildren(QItemSelectionModel)) == selection_models
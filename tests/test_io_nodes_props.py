@@ -19,7 +19,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.io import import_, export, module_parser, new, copy_node, node_factory
 from src.exceptions import TagNotFound, ParserError, BaseInstanceException
 from src.nodes import _NodeElement
-from src.props import _PropertyBase
+from src.props import _PropertyBase, PropertyCombo
 
 
 def test_import_export(tmpdir):
@@ -64,6 +64,17 @@ def test_exceptions():
     assert (None, None) == import_(os.path.join(os.path.dirname(__file__), "boop"))
 
 
+def test_property_combo():
+    prop = PropertyCombo("test", ["a", "b", "c"])
+    assert prop.value == "a"
+    assert prop.value_index == {"a": 0, "b": 1, "c": 2}
+
+    prop.set_value("c")
+    assert prop.value == "c"
+    prop.set_value("d")
+    assert prop.value == "c"
+
+
 def test_node_operations():
     base_info = "<fomod/>"
     base_config = "<config xmlns:xsi=\"http://www.w3.org/2001/XMLSchema-instance\" " \